@@ -0,0 +1,183 @@
+import hashlib
+import numpy as np
+
+EMBEDDING_DIMENSION = 384
+
+
+def normalize(vectors):
+    """
+    L2-normalize a batch of vectors so dot products equal cosine similarity.
+
+    Args:
+        vectors: Array of shape (n, dim)
+
+    Returns:
+        float32 array of the same shape
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def fit_pca(vectors, dim):
+    """
+    Fit a PCA projection on a corpus of embeddings.
+
+    Args:
+        vectors: Array of shape (n, full_dim) with corpus embeddings
+        dim: Number of principal components to keep
+
+    Returns:
+        Dict with "mean" (full_dim,) and "components" (dim, full_dim)
+
+    Raises:
+        ValueError: If dim is invalid for the given corpus
+    """
+    vectors = normalize(vectors)
+    n, full_dim = vectors.shape
+
+    if not isinstance(dim, int) or dim <= 0:
+        raise ValueError(f"dim must be a positive integer, got {dim}")
+
+    if dim > min(n, full_dim):
+        raise ValueError(f"dim ({dim}) cannot exceed min(corpus size, vector size) = {min(n, full_dim)}")
+
+    mean = vectors.mean(axis=0)
+    _, _, vt = np.linalg.svd(vectors - mean, full_matrices=False)
+    return {"mean": mean, "components": vt[:dim].astype(np.float32)}
+
+
+def pca_fingerprint(pca):
+    """
+    Short hash identifying a PCA projection, so stored vectors can be tied to it.
+    """
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(pca["mean"], dtype=np.float32).tobytes())
+    digest.update(np.ascontiguousarray(pca["components"], dtype=np.float32).tobytes())
+    return digest.hexdigest()[:12]
+
+
+def save_pca(path, pca):
+    np.savez(
+        path,
+        mean=pca["mean"],
+        components=pca["components"],
+        fingerprint=pca_fingerprint(pca),
+    )
+
+
+def load_pca(path):
+    """
+    Load a PCA projection written by save_pca.
+
+    Returns:
+        Dict with "mean", "components" and "fingerprint"
+
+    Raises:
+        ValueError: If the file does not exist, is malformed or its fingerprint
+            does not match its contents
+    """
+    try:
+        data = np.load(path)
+        pca = {"mean": data["mean"], "components": data["components"]}
+        stored = str(data["fingerprint"])
+    except FileNotFoundError:
+        raise ValueError(
+            f"PCA projection not found at {path}. "
+            "Fit one with: python -m app.vector_benchmark --save-pca <path> --pca-dim <dim>"
+        )
+    except Exception as e:
+        raise ValueError(f"Failed to load PCA projection from {path}: {str(e)}")
+
+    pca["fingerprint"] = pca_fingerprint(pca)
+    if pca["fingerprint"] != stored:
+        raise ValueError(
+            f"PCA projection at {path} is corrupted: fingerprint {stored} "
+            f"does not match its contents ({pca['fingerprint']})"
+        )
+    return pca
+
+
+def reduce_vectors(vectors, method, dim, pca=None):
+    """
+    Reduce embedding dimensionality.
+
+    Args:
+        vectors: Array of shape (n, full_dim)
+        method: "none", "truncate" (keep the first dim values) or "pca"
+        dim: Target dimension (ignored for "none")
+        pca: Projection returned by fit_pca/load_pca, required for "pca"
+
+    Returns:
+        Normalized float32 array of shape (n, dim)
+
+    Raises:
+        ValueError: If method is unknown or pca is missing
+    """
+    vectors = normalize(vectors)
+
+    if method == "none":
+        return vectors
+
+    if method == "truncate":
+        if not 0 < dim <= vectors.shape[1]:
+            raise ValueError(f"Cannot truncate {vectors.shape[1]}-dim vectors to {dim} dims")
+        return normalize(vectors[:, :dim])
+
+    if method == "pca":
+        if pca is None:
+            raise ValueError("A fitted PCA projection is required for method 'pca'")
+        return normalize((vectors - pca["mean"]) @ pca["components"].T)
+
+    raise ValueError(f"Unknown reduction method '{method}'. Must be 'none', 'truncate' or 'pca'")
+
+
+def simulate_int8(vectors, quantile=0.99, reference=None):
+    """
+    Approximate Qdrant scalar int8 quantization: clip to the given quantile range,
+    map to 256 levels and map back to float.
+
+    Args:
+        vectors: Array of shape (n, dim)
+        quantile: Fraction of values kept inside the quantization range
+        reference: Vectors the range is computed on (defaults to vectors); pass
+            the corpus when quantizing queries
+
+    Returns:
+        float32 array with the values the int8 codes represent
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    reference = vectors if reference is None else np.asarray(reference, dtype=np.float32)
+    low = np.quantile(reference, 1 - quantile)
+    high = np.quantile(reference, quantile)
+    scale = (high - low) / 255 or 1.0
+    codes = np.round((np.clip(vectors, low, high) - low) / scale)
+    return (codes * scale + low).astype(np.float32)
+
+
+def simulate_binary(vectors):
+    """
+    Approximate Qdrant binary quantization: keep only the sign of each value.
+
+    Returns:
+        float32 array of +1/-1 values
+    """
+    return np.where(np.asarray(vectors) > 0, 1.0, -1.0).astype(np.float32)
+
+
+def bytes_per_vector(dim, quantization):
+    """
+    RAM needed to hold one vector in the search index (excluding the HNSW graph).
+
+    Args:
+        dim: Vector dimension
+        quantization: "none", "int8" or "binary"
+    """
+    if quantization == "none":
+        return dim * 4
+    if quantization == "int8":
+        return dim
+    if quantization == "binary":
+        return (dim + 7) // 8
+    raise ValueError(f"Unknown quantization '{quantization}'. Must be 'none', 'int8' or 'binary'")
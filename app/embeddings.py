@@ -1,26 +1,205 @@
+import math
+import os
+from dotenv import load_dotenv
 from sentence_transformers import SentenceTransformer
 from qdrant_client import QdrantClient
-from qdrant_client.models import VectorParams, Distance, PointStruct
+from qdrant_client.models import (
+    VectorParams, Distance, PointStruct, NamedVector,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    BinaryQuantization, BinaryQuantizationConfig,
+    SearchParams, QuantizationSearchParams,
+)
+from .compression import EMBEDDING_DIMENSION, normalize, reduce_vectors, load_pca
+
+load_dotenv()
+
+QDRANT_HOST = os.getenv("QDRANT_HOST", "qdrant")
+QDRANT_PORT = int(os.getenv("QDRANT_PORT", 6333))
 
 MODEL = SentenceTransformer("all-MiniLM-L6-v2")
-qdrant = QdrantClient(host="qdrant", port=6333)
+qdrant = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+
+# Compact vector mode (opt-in). Defaults keep the original full-precision collection.
+# Use `python -m app.vector_benchmark` to pick a setting for your corpus.
+VECTOR_QUANTIZATION = os.getenv("VECTOR_QUANTIZATION", "none")   # none | int8 | binary
+VECTOR_REDUCTION = os.getenv("VECTOR_REDUCTION", "none")         # none | truncate | pca
+VECTOR_REDUCED_DIM = int(os.getenv("VECTOR_REDUCED_DIM", 128))
+VECTOR_PCA_PATH = os.getenv("VECTOR_PCA_PATH", "app/pca_projection.npz")  # app/ is bind-mounted
+RESCORE_OVERSAMPLING = float(os.getenv("RESCORE_OVERSAMPLING", 3.0))
+
+COMPACT_MODE = VECTOR_QUANTIZATION != "none" or VECTOR_REDUCTION != "none"
+
+# Each compact setting gets its own collection so switching modes never mixes layouts.
+# In PCA mode init_qdrant appends the projection fingerprint to the name.
+if COMPACT_MODE:
+    COLLECTION_NAME = f"document_embeddings_{VECTOR_QUANTIZATION}_{VECTOR_REDUCTION}"
+    if VECTOR_REDUCTION != "none":
+        COLLECTION_NAME += str(VECTOR_REDUCED_DIM)
+else:
+    COLLECTION_NAME = "document_embeddings"
+
+PCA = None
+
+
+def _validate_config():
+    if VECTOR_QUANTIZATION not in ["none", "int8", "binary"]:
+        raise ValueError(
+            f"Invalid VECTOR_QUANTIZATION '{VECTOR_QUANTIZATION}'. Must be 'none', 'int8' or 'binary'"
+        )
+
+    if VECTOR_REDUCTION not in ["none", "truncate", "pca"]:
+        raise ValueError(
+            f"Invalid VECTOR_REDUCTION '{VECTOR_REDUCTION}'. Must be 'none', 'truncate' or 'pca'"
+        )
+
+    if VECTOR_REDUCTION != "none" and not 0 < VECTOR_REDUCED_DIM < EMBEDDING_DIMENSION:
+        raise ValueError(
+            f"VECTOR_REDUCED_DIM must be between 1 and {EMBEDDING_DIMENSION - 1}, got {VECTOR_REDUCED_DIM}"
+        )
+
+    if RESCORE_OVERSAMPLING < 1.0:
+        raise ValueError(f"RESCORE_OVERSAMPLING must be at least 1.0, got {RESCORE_OVERSAMPLING}")
+
+
+def _quantization_config():
+    if VECTOR_QUANTIZATION == "int8":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+    if VECTOR_QUANTIZATION == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    return None
+
+
+def _vectors_config():
+    if not COMPACT_MODE:
+        return VectorParams(size=EMBEDDING_DIMENSION, distance=Distance.COSINE)
+
+    if VECTOR_REDUCTION == "none":
+        # Quantized copy stays in RAM, originals go to disk and are used by Qdrant to rescore
+        return VectorParams(
+            size=EMBEDDING_DIMENSION,
+            distance=Distance.COSINE,
+            on_disk=True,
+            quantization_config=_quantization_config(),
+        )
+
+    # Reduced vectors are searched, full-precision vectors on disk are only read for rescoring
+    return {
+        "compact": VectorParams(
+            size=VECTOR_REDUCED_DIM,
+            distance=Distance.COSINE,
+            on_disk=VECTOR_QUANTIZATION != "none",
+            quantization_config=_quantization_config(),
+        ),
+        "full": VectorParams(size=EMBEDDING_DIMENSION, distance=Distance.COSINE, on_disk=True),
+    }
+
+
+def _reduce(vectors):
+    return reduce_vectors(vectors, VECTOR_REDUCTION, VECTOR_REDUCED_DIM, pca=PCA)
 
-COLLECTION_NAME = "document_embeddings"
 
 # Create collection if not exists
 def init_qdrant():
+    global PCA, COLLECTION_NAME
+    _validate_config()
+
+    if VECTOR_REDUCTION == "pca":
+        PCA = load_pca(VECTOR_PCA_PATH)
+        if PCA["components"].shape[0] != VECTOR_REDUCED_DIM:
+            raise ValueError(
+                f"PCA projection has {PCA['components'].shape[0]} dims, "
+                f"VECTOR_REDUCED_DIM is {VECTOR_REDUCED_DIM}"
+            )
+
+        # Vectors projected with another PCA fit cannot be searched with this one
+        prefix = COLLECTION_NAME + "_"
+        COLLECTION_NAME = prefix + PCA["fingerprint"]
+        stale = [
+            collection.name for collection in qdrant.get_collections().collections
+            if collection.name.startswith(prefix) and collection.name != COLLECTION_NAME
+        ]
+        if stale:
+            raise ValueError(
+                f"PCA projection at {VECTOR_PCA_PATH} (fingerprint {PCA['fingerprint']}) "
+                f"does not match the projection used for collection(s) {', '.join(stale)}. "
+                "Restore the original projection, or delete those collections and re-upload the documents."
+            )
+
     try:
         qdrant.get_collection(COLLECTION_NAME)
     except:
         qdrant.create_collection(
             collection_name=COLLECTION_NAME,
-            vectors_config=VectorParams(size=384, distance=Distance.COSINE)
+            vectors_config=_vectors_config()
         )
 
 def store_embeddings(chunks, metadata):
-    vectors = MODEL.encode(chunks).tolist()
+    vectors = MODEL.encode(chunks)
+    if COMPACT_MODE and VECTOR_REDUCTION != "none":
+        full = normalize(vectors).tolist()
+        compact = _reduce(vectors).tolist()
+        vectors = [{"full": full[i], "compact": compact[i]} for i in range(len(chunks))]
+    else:
+        vectors = vectors.tolist()
     points = [
         PointStruct(id=i, vector=vectors[i], payload={"metadata": metadata, "text": chunks[i]})
         for i in range(len(chunks))
     ]
     qdrant.upsert(collection_name=COLLECTION_NAME, points=points)
+
+
+def search_embeddings(query, limit=3):
+    """
+    Search stored chunks for the query, rescoring compact-mode candidates
+    with full-precision vectors.
+
+    Args:
+        query: Query text
+        limit: Number of results to return
+
+    Returns:
+        List of Qdrant ScoredPoint results, best first
+    """
+    query_vector = MODEL.encode([query])
+
+    if not COMPACT_MODE:
+        return qdrant.search(
+            collection_name=COLLECTION_NAME,
+            query_vector=query_vector.tolist()[0],
+            limit=limit
+        )
+
+    search_params = None
+    if VECTOR_QUANTIZATION != "none":
+        search_params = SearchParams(
+            quantization=QuantizationSearchParams(rescore=True, oversampling=RESCORE_OVERSAMPLING)
+        )
+
+    if VECTOR_REDUCTION == "none":
+        return qdrant.search(
+            collection_name=COLLECTION_NAME,
+            query_vector=query_vector.tolist()[0],
+            search_params=search_params,
+            limit=limit
+        )
+
+    candidates = qdrant.search(
+        collection_name=COLLECTION_NAME,
+        query_vector=NamedVector(name="compact", vector=_reduce(query_vector).tolist()[0]),
+        search_params=search_params,
+        limit=math.ceil(limit * RESCORE_OVERSAMPLING),
+        with_vectors=["full"]
+    )
+    if not candidates:
+        return []
+
+    # Rescore against the full-precision vectors (stored normalized, so dot == cosine)
+    query_full = normalize(query_vector)[0]
+    full = normalize([hit.vector["full"] for hit in candidates])
+    scores = full @ query_full
+    for hit, score in zip(candidates, scores):
+        hit.score = float(score)
+        hit.vector = None
+    return sorted(candidates, key=lambda hit: hit.score, reverse=True)[:limit]
@@ -1,8 +1,6 @@
 # app/operation.py
 
 import os
-from qdrant_client import QdrantClient
-from sentence_transformers import SentenceTransformer
 from langchain_groq import ChatGroq
 import redis
 from dotenv import load_dotenv
@@ -12,6 +10,7 @@ from typing import Literal
 from pydantic import BaseModel, Field
 from .database import Base, engine, SessionLocal
 from .models import InterviewBooking_table
+from .embeddings import search_embeddings
 
 
 Base.metadata.create_all(bind=engine)
@@ -22,20 +21,11 @@ load_dotenv()
 # --------------------------
 # Configuration
 # --------------------------
-QDRANT_HOST = os.getenv("QDRANT_HOST", "qdrant")
-QDRANT_PORT = int(os.getenv("QDRANT_PORT", 6333))
 REDIS_HOST = os.getenv("REDIS_HOST", "redis")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-COLLECTION_NAME = "document_embeddings"
 MAX_MEMORY = 10
 
-# --------------------------
-# Qdrant setup
-# --------------------------
-qdrant = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
-MODEL = SentenceTransformer("all-MiniLM-L6-v2")
-
 # --------------------------
 # Groq LLM setup
 # --------------------------
@@ -106,12 +96,7 @@ def rag(user_input, top_k=3, session_id="default"):
     """
     try:
         # 1. Search Qdrant for relevant chunks
-        embedding = MODEL.encode([user_input]).tolist()[0]
-        results = qdrant.search(
-            collection_name=COLLECTION_NAME,
-            query_vector=embedding,
-            limit=top_k
-        )
+        results = search_embeddings(user_input, limit=top_k)
         
         # Extract text from results
         chunks = [hit.payload.get("text", "") for hit in results if hit.payload.get("text")]
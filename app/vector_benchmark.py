@@ -0,0 +1,214 @@
+"""
+Measure the recall / memory tradeoff of compact vector settings on our own corpus.
+
+Pulls the stored full-precision embeddings from Qdrant, then for every combination
+of dimension reduction and quantization compares the top-k it returns (with and
+without full-precision rescoring) against exact full-precision top-k.
+
+Usage:
+    python -m app.vector_benchmark
+    python -m app.vector_benchmark --queries questions.txt --k 3 --oversampling 3
+    python -m app.vector_benchmark --save-pca app/pca_projection.npz --pca-dim 128
+"""
+
+import argparse
+import math
+import numpy as np
+from .compression import (
+    EMBEDDING_DIMENSION, normalize, fit_pca, save_pca, reduce_vectors,
+    simulate_int8, simulate_binary, bytes_per_vector,
+)
+
+
+def load_corpus_vectors(collection_name, batch_size=256):
+    """
+    Scroll every stored vector out of a collection.
+
+    Works for the default collection (unnamed vector) and compact collections
+    (named "full" vector).
+    """
+    # Imported here so the scoring helpers can be used without loading the model
+    from .embeddings import qdrant
+
+    vectors = []
+    offset = None
+    while True:
+        records, offset = qdrant.scroll(
+            collection_name=collection_name,
+            limit=batch_size,
+            offset=offset,
+            with_payload=False,
+            with_vectors=True
+        )
+        for record in records:
+            vector = record.vector
+            if isinstance(vector, dict):
+                vector = vector["full"]
+            vectors.append(vector)
+        if offset is None:
+            break
+
+    if not vectors:
+        raise ValueError(f"Collection '{collection_name}' has no vectors to benchmark")
+
+    return normalize(vectors)
+
+
+def top_k(scores, k):
+    """Indices of the k highest scores per row, best first."""
+    k = min(k, scores.shape[1])
+    idx = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, idx, axis=1), axis=1)
+    return np.take_along_axis(idx, order, axis=1)
+
+
+def recall(found, truth):
+    hits = [len(set(f) & set(t)) for f, t in zip(found, truth)]
+    return sum(hits) / (len(truth) * truth.shape[1])
+
+
+def evaluate(corpus, queries, exclude, k, oversampling, reductions, quantizations):
+    """
+    Args:
+        corpus: Normalized full-precision corpus vectors (n, dim)
+        queries: Normalized full-precision query vectors (q, dim)
+        exclude: Corpus index to ignore per query (its own chunk) or None
+        k: Number of results per query
+        oversampling: Candidates fetched for rescoring = ceil(k * oversampling)
+        reductions: List of (method, dim, pca) tuples
+        quantizations: List of "none" / "int8" / "binary"
+
+    Returns:
+        List of result rows (dicts)
+
+    Raises:
+        ValueError: If k exceeds the number of searchable corpus vectors
+    """
+    def mask(scores):
+        if exclude is not None:
+            scores[np.arange(len(exclude)), exclude] = -np.inf
+        return scores
+
+    n = len(corpus)
+    # A query's own chunk is never a valid result
+    searchable = n - 1 if exclude is not None else n
+    if k <= 0 or k > searchable:
+        raise ValueError(f"k must be between 1 and {searchable} for this corpus, got {k}")
+
+    truth = top_k(mask(queries @ corpus.T), k)
+    candidates = min(math.ceil(k * oversampling), searchable)
+    rows = []
+
+    for method, dim, pca in reductions:
+        corpus_reduced = reduce_vectors(corpus, method, dim, pca=pca)
+        queries_reduced = reduce_vectors(queries, method, dim, pca=pca)
+
+        for quantization in quantizations:
+            if quantization == "int8":
+                corpus_q = simulate_int8(corpus_reduced)
+                queries_q = simulate_int8(queries_reduced, reference=corpus_reduced)
+            elif quantization == "binary":
+                corpus_q, queries_q = simulate_binary(corpus_reduced), simulate_binary(queries_reduced)
+            else:
+                corpus_q, queries_q = corpus_reduced, queries_reduced
+
+            compact_scores = mask(queries_q @ corpus_q.T)
+            plain = top_k(compact_scores, k)
+
+            # Rescore the oversampled candidates with full-precision vectors
+            pool = top_k(compact_scores, candidates)
+            full_scores = np.einsum("qd,qcd->qc", queries, corpus[pool])
+            if exclude is not None:
+                full_scores[pool == exclude[:, None]] = -np.inf
+            order = np.argsort(-full_scores, axis=1)[:, :k]
+            rescored = np.take_along_axis(pool, order, axis=1)
+
+            ram = bytes_per_vector(dim, quantization)
+            # Originals are kept on disk for rescoring whenever the index is compact
+            compact = method != "none" or quantization != "none"
+            disk = (bytes_per_vector(EMBEDDING_DIMENSION, "none") if compact else 0)
+            if method != "none" and quantization != "none":
+                disk += bytes_per_vector(dim, "none")
+
+            rows.append({
+                "reduction": method if method == "none" else f"{method}-{dim}",
+                "quantization": quantization,
+                "recall": recall(plain, truth),
+                "recall_rescored": recall(rescored, truth),
+                "candidates": candidates,
+                "ram_per_vector": ram,
+                "ram_total": ram * n,
+                "disk_per_vector": disk,
+            })
+
+    return rows
+
+
+def format_bytes(size):
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def print_report(rows, n, q, k):
+    baseline = bytes_per_vector(EMBEDDING_DIMENSION, "none")
+    print(f"Corpus: {n} vectors, {q} queries, recall@{k}, rescoring {rows[0]['candidates']} candidates")
+    print("RAM counts search vectors only (HNSW graph and payloads excluded).\n")
+    header = f"{'reduction':<14}{'quant':<8}{'recall':>8}{'rescored':>10}{'RAM/vec':>10}{'RAM total':>12}{'saving':>8}{'disk/vec':>10}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['reduction']:<14}{row['quantization']:<8}"
+            f"{row['recall']:>8.3f}{row['recall_rescored']:>10.3f}"
+            f"{row['ram_per_vector']:>10}{format_bytes(row['ram_total']):>12}"
+            f"{baseline / row['ram_per_vector']:>7.1f}x{row['disk_per_vector']:>10}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compact vector settings on the stored corpus")
+    parser.add_argument("--collection", default="document_embeddings", help="Collection holding the full-precision corpus")
+    parser.add_argument("--queries", help="Text file with one query per line (default: sample corpus chunks as queries)")
+    parser.add_argument("--num-queries", type=int, default=200, help="Number of corpus chunks sampled as queries")
+    parser.add_argument("--k", type=int, default=3, help="Results per query (the app uses top 3)")
+    parser.add_argument("--oversampling", type=float, default=3.0, help="Rescoring candidates = ceil(k * oversampling)")
+    parser.add_argument("--dims", type=int, nargs="+", default=[64, 128, 192], help="Reduced dimensions to try")
+    parser.add_argument("--save-pca", help="Fit PCA on the corpus and write the projection here")
+    parser.add_argument("--pca-dim", type=int, default=128, help="Dimension of the projection written by --save-pca")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = load_corpus_vectors(args.collection)
+
+    if args.save_pca:
+        save_pca(args.save_pca, fit_pca(corpus, args.pca_dim))
+        print(f"Saved {args.pca_dim}-dim PCA projection to {args.save_pca}")
+        return
+
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as f:
+            lines = [line.strip() for line in f if line.strip()]
+        if not lines:
+            raise ValueError(f"No queries found in {args.queries}")
+        from .embeddings import MODEL
+        queries = normalize(MODEL.encode(lines))
+        exclude = None
+    else:
+        rng = np.random.default_rng(args.seed)
+        exclude = rng.choice(len(corpus), size=min(args.num_queries, len(corpus)), replace=False)
+        queries = corpus[exclude]
+
+    dims = [d for d in args.dims if d < min(len(corpus), EMBEDDING_DIMENSION)]
+    reductions = [("none", EMBEDDING_DIMENSION, None)]
+    reductions += [("truncate", d, None) for d in dims]
+    reductions += [("pca", d, fit_pca(corpus, d)) for d in dims]
+
+    rows = evaluate(corpus, queries, exclude, args.k, args.oversampling, reductions, ["none", "int8", "binary"])
+    print_report(rows, len(corpus), len(queries), args.k)
+
+
+if __name__ == "__main__":
+    main()
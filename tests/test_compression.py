@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from app.compression import (
+    normalize, fit_pca, save_pca, load_pca, reduce_vectors,
+    simulate_int8, simulate_binary, bytes_per_vector,
+)
+
+
+def random_vectors(n, dim=384, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, dim))
+
+
+def assert_unit_norm(vectors):
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-5)
+
+
+def test_normalize_unit_norm_and_zero_vector():
+    vectors = normalize(np.vstack([random_vectors(3), np.zeros((1, 384))]))
+    assert vectors.dtype == np.float32
+    assert_unit_norm(vectors[:3])
+    assert not vectors[3].any()
+
+
+def test_fit_pca_shapes():
+    pca = fit_pca(random_vectors(50), 16)
+    assert pca["mean"].shape == (384,)
+    assert pca["components"].shape == (16, 384)
+
+
+@pytest.mark.parametrize("dim", [0, -1, 51, 385])
+def test_fit_pca_rejects_out_of_range_dim(dim):
+    with pytest.raises(ValueError):
+        fit_pca(random_vectors(50), dim)
+
+
+def test_fit_pca_accepts_upper_bound():
+    assert fit_pca(random_vectors(50), 50)["components"].shape == (50, 384)
+
+
+def test_pca_roundtrip_keeps_fingerprint(tmp_path):
+    path = str(tmp_path / "pca.npz")
+    pca = fit_pca(random_vectors(50), 8)
+    save_pca(path, pca)
+    loaded = load_pca(path)
+    np.testing.assert_array_equal(loaded["components"], pca["components"])
+    assert len(loaded["fingerprint"]) == 12
+
+
+def test_load_pca_rejects_tampered_file(tmp_path):
+    path = str(tmp_path / "pca.npz")
+    save_pca(path, fit_pca(random_vectors(50), 8))
+    data = dict(np.load(path))
+    data["mean"] = data["mean"] + 1
+    np.savez(path, **data)
+    with pytest.raises(ValueError):
+        load_pca(path)
+
+
+def test_load_pca_missing_file(tmp_path):
+    with pytest.raises(ValueError):
+        load_pca(str(tmp_path / "missing.npz"))
+
+
+@pytest.mark.parametrize("method, dim", [("none", 384), ("truncate", 64), ("pca", 16)])
+def test_reduce_vectors_shapes_and_norm(method, dim):
+    corpus = random_vectors(50)
+    pca = fit_pca(corpus, dim) if method == "pca" else None
+    reduced = reduce_vectors(corpus, method, dim, pca=pca)
+    assert reduced.shape == (50, dim)
+    assert_unit_norm(reduced)
+
+
+@pytest.mark.parametrize("method, dim, pca", [
+    ("truncate", 0, None),
+    ("truncate", 385, None),
+    ("pca", 16, None),
+    ("unknown", 16, None),
+])
+def test_reduce_vectors_rejects_invalid(method, dim, pca):
+    with pytest.raises(ValueError):
+        reduce_vectors(random_vectors(5), method, dim, pca=pca)
+
+
+def test_simulate_int8_uses_256_levels_within_range():
+    vectors = normalize(random_vectors(100))
+    quantized = simulate_int8(vectors)
+    assert quantized.shape == vectors.shape
+    assert len(np.unique(quantized)) <= 256
+
+    # Values inside the quantile range are off by at most half a step
+    low, high = np.quantile(vectors, 0.01), np.quantile(vectors, 0.99)
+    inside = (vectors >= low) & (vectors <= high)
+    assert np.abs(quantized - vectors)[inside].max() <= (high - low) / 255 / 2 + 1e-6
+
+
+def test_simulate_int8_queries_use_reference_range():
+    corpus = normalize(random_vectors(100))
+    query = corpus[:1] * 10
+    quantized = simulate_int8(query, reference=corpus)
+    assert quantized.max() <= np.quantile(corpus, 0.99) + 1e-6
+
+
+def test_simulate_binary_signs():
+    quantized = simulate_binary([[0.5, -0.2, 0.0]])
+    np.testing.assert_array_equal(quantized, [[1.0, -1.0, -1.0]])
+
+
+@pytest.mark.parametrize("dim, quantization, expected", [
+    (384, "none", 1536),
+    (384, "int8", 384),
+    (384, "binary", 48),
+    (100, "binary", 13),
+])
+def test_bytes_per_vector(dim, quantization, expected):
+    assert bytes_per_vector(dim, quantization) == expected
+
+
+def test_bytes_per_vector_rejects_unknown():
+    with pytest.raises(ValueError):
+        bytes_per_vector(384, "float16")
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from app.compression import normalize
+from app.vector_benchmark import top_k, recall, evaluate
+
+FULL = [("none", 384, None)]
+
+
+def corpus(n, seed=0):
+    return normalize(np.random.default_rng(seed).normal(size=(n, 384)))
+
+
+def test_top_k_orders_best_first():
+    scores = np.array([[0.1, 0.9, 0.5, 0.7]])
+    np.testing.assert_array_equal(top_k(scores, 3), [[1, 3, 2]])
+
+
+def test_top_k_clamps_to_width():
+    assert top_k(np.array([[0.1, 0.2]]), 5).shape == (1, 2)
+
+
+def test_recall():
+    truth = np.array([[0, 1], [2, 3]])
+    found = np.array([[1, 0], [2, 4]])
+    assert recall(found, truth) == 0.75
+
+
+def test_evaluate_exact_setting_has_full_recall():
+    vectors = corpus(200)
+    exclude = np.arange(20)
+    rows = evaluate(vectors, vectors[exclude], exclude, 3, 3.0, FULL, ["none"])
+    assert rows[0]["recall"] == 1.0
+    assert rows[0]["recall_rescored"] == 1.0
+
+
+def test_evaluate_small_corpus_ignores_query_chunk_when_rescoring():
+    vectors = corpus(5)
+    exclude = np.arange(5)
+    rows = evaluate(vectors, vectors[exclude], exclude, 3, 3.0, FULL, ["none"])
+    assert rows[0]["recall"] == 1.0
+    assert rows[0]["recall_rescored"] == 1.0
+    assert rows[0]["candidates"] == 4
+
+
+def test_evaluate_without_exclusion_allows_whole_corpus():
+    vectors = corpus(5)
+    rows = evaluate(vectors, vectors, None, 5, 2.0, FULL, ["none"])
+    assert rows[0]["recall_rescored"] == 1.0
+    assert rows[0]["candidates"] == 5
+
+
+@pytest.mark.parametrize("k", [0, 5])
+def test_evaluate_rejects_k_beyond_searchable(k):
+    vectors = corpus(5)
+    exclude = np.arange(5)
+    with pytest.raises(ValueError):
+        evaluate(vectors, vectors[exclude], exclude, k, 3.0, FULL, ["none"])
+
+
+def test_evaluate_reports_memory_per_setting():
+    vectors = corpus(50)
+    exclude = np.arange(5)
+    rows = evaluate(vectors, vectors[exclude], exclude, 3, 3.0, FULL + [("truncate", 64, None)], ["none", "int8", "binary"])
+    by_setting = {(row["reduction"], row["quantization"]): row for row in rows}
+    assert by_setting[("none", "none")]["ram_per_vector"] == 1536
+    assert by_setting[("none", "none")]["disk_per_vector"] == 0
+    assert by_setting[("none", "int8")]["disk_per_vector"] == 1536
+    assert by_setting[("truncate-64", "binary")]["ram_per_vector"] == 8
+    assert by_setting[("truncate-64", "binary")]["ram_total"] == 8 * 50
+    assert by_setting[("truncate-64", "int8")]["disk_per_vector"] == 1536 + 256